@@ -1,34 +1,296 @@
 import os
+import json
 import time
 import random
+import sqlite3
+import hashlib
+import unicodedata
+import queue
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import Future, TimeoutError as FutureTimeout
 import streamlit as st
-from typing import List, Dict, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 
-# scholarly é opcional se você optar por usar só SerpAPI
+# orjson é opcional: parsing de JSON 2–3x mais rápido que o módulo padrão
 try:
-    from scholarly import scholarly, ProxyGenerator
-    HAS_SCHOLARLY = True
+    import orjson
+    HAS_ORJSON = True
 except Exception:
-    HAS_SCHOLARLY = False
+    HAS_ORJSON = False
 
 
 # -------------- Configurações da Página --------------
+# set_page_config precisa ser o primeiro comando Streamlit do script
 st.set_page_config(page_title="Top Researchers by Research Area", layout="wide")
 st.title("Top Researchers by Research Area")
 
+
+# -------------- Cache persistente --------------
+CACHE_PATH = os.getenv("RESEARCH_CACHE_PATH", "research_cache.sqlite3")
+caching_ttl = 3600        # segundos em que o resultado é considerado fresco
+caching_swr_ttl = 86400   # janela extra em que servimos o antigo e revalidamos em background
+
+
+@st.cache_resource(show_spinner=False)
+def _init_cache_db() -> None:
+    # cria a tabela uma única vez por processo (cache_resource sobrevive aos reruns)
+    conn = sqlite3.connect(CACHE_PATH, timeout=10)
+    try:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _cache_conn() -> sqlite3.Connection:
+    # a concorrência entre sessões/threads fica com o lock do próprio sqlite (timeout=10)
+    _init_cache_db()
+    return sqlite3.connect(CACHE_PATH, timeout=10)
+
+
+def cache_key(engine: str, area: str, max_results: int) -> str:
+    return hashlib.sha1(f"{engine}|{area}|{max_results}".encode("utf-8")).hexdigest()
+
+
+def cache_get(key: str) -> Tuple[Optional[List[Dict]], float]:
+    """
+    Retorna (payload, idade_em_segundos); payload é None se não houver entrada.
+    O cache é best-effort: qualquer erro do sqlite vira um miss.
+    """
+    try:
+        conn = _cache_conn()
+        try:
+            row = conn.execute(
+                "SELECT payload, fetched_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        _init_cache_db.clear()  # ex.: arquivo apagado; recria a tabela na próxima chamada
+        return None, float("inf")
+    if row is None:
+        return None, float("inf")
+    return json.loads(row[0]), time.time() - row[1]
+
+
+def cache_set(key: str, payload: List[Dict]) -> None:
+    # best-effort: sem permissão de escrita ou com o banco travado, só não grava
+    try:
+        conn = _cache_conn()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, payload, fetched_at) VALUES (?, ?, ?)",
+                (key, json.dumps(payload, ensure_ascii=False), time.time()),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        _init_cache_db.clear()
+
+
+@st.cache_resource(show_spinner=False)
+def _inflight_registry() -> Tuple[Dict[str, Future], threading.Lock]:
+    # cache_resource: o registro sobrevive aos reruns e é compartilhado entre sessões
+    return {}, threading.Lock()
+
+
+# Tempo máximo (s) que uma busca idêntica espera pela que já está em andamento
+DEDUP_WAIT_TIMEOUT = 180
+
+
+class _FlightAborted(Exception):
+    """A busca dona da chave foi interrompida (rerun/stop do Streamlit); quem esperava tenta de novo."""
+
+
+def dedup_fetch(key: str, fn: Callable[[], List[Dict]]) -> List[Dict]:
+    """
+    Single-flight: chamadas simultâneas com a mesma chave esperam a mesma busca
+    em vez de disparar requisições duplicadas.
+    Só erros comuns (Exception) são repassados a quem espera; RerunException/StopException
+    do Streamlit ficam na sessão dona, e as outras refazem a busca. Quem espera mais de
+    DEDUP_WAIT_TIMEOUT segundos desiste da busca dona e faz a sua.
+    """
+    inflight, lock = _inflight_registry()
+    while True:
+        with lock:
+            fut = inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = Future()
+                inflight[key] = fut
+        if owner:
+            break
+        try:
+            return fut.result(timeout=DEDUP_WAIT_TIMEOUT)
+        except _FlightAborted:
+            continue
+        except FutureTimeout:
+            # a busca dona parece travada: não prende esta sessão a ela, busca por conta própria
+            return fn()
+
+    def release():
+        # remove a entrada antes de sinalizar, para quem tenta de novo não pegar o Future antigo
+        with lock:
+            inflight.pop(key, None)
+
+    try:
+        result = fn()
+    except Exception as e:
+        release()
+        fut.set_exception(e)
+        raise
+    except BaseException:
+        release()
+        fut.set_exception(_FlightAborted())
+        raise
+    release()
+    fut.set_result(result)
+    return result
+
+
+def cached_fetch(engine: str, area: str, max_results: int,
+                 fetch_fn: Callable[[], List[Dict]],
+                 refresh_fn: Callable[[], List[Dict]]) -> Tuple[List[Dict], str]:
+    """
+    Stale-while-revalidate sobre o cache em disco. Retorna (resultados, estado):
+    - FRESH:  idade <= ttl, devolve o cache;
+    - STALE:  ttl < idade <= ttl + swr, devolve o cache e atualiza em background;
+    - ROTTEN: sem cache ou muito antigo, busca de forma síncrona.
+    `fetch_fn` roda na thread do script e pode exibir avisos; `refresh_fn` roda numa
+    thread sem ScriptRunContext, então não deve chamar o Streamlit.
+    Resultados vazios não são gravados para não mascarar buscas futuras; falhas
+    da busca síncrona sobem como exceção (ver fetch_with_fallback).
+    """
+    key = cache_key(engine, area, max_results)
+    payload, age = cache_get(key)
+
+    if payload is not None and age <= caching_ttl:
+        return payload, "FRESH"
+
+    if payload is not None and age <= caching_ttl + caching_swr_ttl:
+        def refresh():
+            try:
+                fresh = dedup_fetch(key, refresh_fn)
+                if fresh:
+                    cache_set(key, fresh)
+            except Exception:
+                pass
+        threading.Thread(target=refresh, daemon=True).start()
+        return payload, "STALE"
+
+    results = dedup_fetch(key, fetch_fn)
+    if results:
+        cache_set(key, results)
+    return results, "ROTTEN"
+
+
+# -------------- Sessão HTTP --------------
+# Sessão única: reaproveita conexões keep-alive (evita novo handshake TLS a cada busca)
+# e repete automaticamente erros transitórios como 429/5xx.
+@st.cache_resource(show_spinner=False)
+def _http_session() -> requests.Session:
+    # cache_resource mantém a mesma sessão (e o pool de conexões) entre reruns do script;
+    # criada sob demanda na primeira busca
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+    ))
+    # Cabeçalhos de navegador: o UA padrão 'python-requests/x.y' é mais penalizado por proxies
+    session.headers.update({
+        "User-Agent": ("Mozilla/5.0 (Macintosh; Intel Mac OS X 14_5) AppleWebKit/537.36 "
+                       "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"),
+        "Accept-Language": "en-US,en;q=0.9",
+    })
+    return session
+
+
 # -------------- Utilitários --------------
-def jitter_sleep(base_low=0.7, base_high=1.4):
-    time.sleep(random.uniform(base_low, base_high))
+# Workers de scholarly.fill (+1 thread de listagem); conservador para não disparar bloqueios do Scholar
+SCHOLARLY_FILL_WORKERS = 3
+# Falhas seguidas (listagem ou perfil) antes de desistir de buscar mais autores
+SCHOLARLY_MAX_ERRORS = 3
 
-def setup_scholarly(use_proxies: bool) -> Tuple[bool, str]:
+# Intervalo mínimo agregado entre requisições ao Scholar, somando todos os workers (regra d=2.0 s)
+_MIN_INTERVAL = 2.0
+
+@st.cache_resource(show_spinner=False)
+def _pacer() -> Tuple[threading.Lock, List[float]]:
+    # (lock, [horário da última requisição]); cache_resource mantém o estado entre reruns e buscas
+    return threading.Lock(), [0.0]
+
+def pace(pacer: Tuple[threading.Lock, List[float]], min_interval: float = _MIN_INTERVAL):
     """
-    Tenta configurar proxies grátis. Retorna (ok, msg).
+    Reserva o próximo horário livre (último + `min_interval` + jitter, relógio monotônico)
+    e espera só o que falta até ele: se a chamada anterior já foi lenta, não dorme.
+    """
+    lock, last_call = pacer
+    with lock:
+        now = time.monotonic()
+        slot = max(now, last_call[0] + min_interval + random.uniform(0, 0.3))
+        last_call[0] = slot
+    if slot > now:
+        time.sleep(slot - now)
+
+def normalize_area(area: str) -> str:
+    """
+    Normaliza o termo de busca (NFKC, NBSP, caixa e espaços) para que variações
+    como ' Machine  Learning' caiam na mesma entrada de cache.
+    """
+    area_norm = unicodedata.normalize("NFKC", area).replace("\xa0", " ").strip().lower()
+    return " ".join(area_norm.split())
+
+def is_throttled(e: Exception) -> bool:
+    """
+    Identifica bloqueio do Google Scholar: tentativas esgotadas no scholarly
+    (pelo nome da classe, que nem toda versão reexporta) ou resposta HTTP 429.
     """
-    if not HAS_SCHOLARLY:
+    if type(e).__name__ in ("MaxTriesExceededException", "DOSException"):
+        return True
+    status = getattr(getattr(e, "response", None), "status_code", None)
+    return getattr(e, "status_code", status) == 429
+
+def remember_or_fallback(key: str, results: List[Dict]) -> Tuple[List[Dict], bool]:
+    """
+    Guarda na sessão o último resultado bom por chave (engine, area, max_results);
+    se a busca veio vazia/falhou, devolve esse último resultado.
+    Retorna (resultados, veio_do_cache).
+    """
+    last_good = st.session_state.setdefault("last_good_cache", {})
+    if results:
+        last_good[key] = results
+        return results, False
+    stale = last_good.get(key)
+    if stale is None:
+        return results, False
+    st.warning("Exibindo resultados em cache — Google Scholar limitou a requisição")
+    return stale, True
+
+def _get_scholarly():
+    """
+    scholarly é opcional se você optar por usar só SerpAPI, e o import é pesado
+    (selenium, bibtexparser, fake-useragent...): só importa quando for usado.
+    Depois do primeiro import, o sys.modules faz as chamadas seguintes serem baratas.
+    Retorna (scholarly, ProxyGenerator) ou (None, None) se o import falhar.
+    """
+    try:
+        from scholarly import scholarly as _s, ProxyGenerator
+    except Exception:
+        return None, None
+    return _s, ProxyGenerator
+
+def _setup_free_proxies() -> Tuple[bool, str]:
+    scholarly, ProxyGenerator = _get_scholarly()
+    if scholarly is None:
         return False, "Biblioteca 'scholarly' não disponível (import falhou)."
-    if not use_proxies:
-        return True, "Sem proxies (modo direto)."
     try:
         pg = ProxyGenerator()
         ok = pg.FreeProxies(timeout=2, wait_time=60)
@@ -40,55 +302,197 @@ def setup_scholarly(use_proxies: bool) -> Tuple[bool, str]:
     except Exception as e:
         return False, f"Erro ao configurar proxies: {e}"
 
-def scholarly_fetch_authors(area: str, max_results: int, use_proxies: bool) -> List[Dict]:
+@st.cache_resource(show_spinner=False)
+def _free_proxies_future() -> Future:
     """
-    Busca autores via scholarly.search_author(area).
-    Tenta contornar bloqueios com pequenas pausas e captura de erros.
+    Dispara a sondagem de FreeProxies (pode levar dezenas de segundos) numa thread,
+    uma única vez por processo; o clique em "Buscar" só espera o que faltar.
+    """
+    fut: Future = Future()
+    def run():
+        try:
+            fut.set_result(_setup_free_proxies())
+        except Exception as e:
+            fut.set_result((False, f"Erro ao configurar proxies: {e}"))
+    threading.Thread(target=run, daemon=True).start()
+    return fut
+
+def setup_scholarly(use_proxies: bool) -> Tuple[bool, str]:
+    """
+    Tenta configurar proxies grátis. Retorna (ok, msg).
+    """
+    scholarly, _ = _get_scholarly()
+    if scholarly is None:
+        return False, "Biblioteca 'scholarly' não disponível (import falhou)."
+    if not use_proxies:
+        return True, "Sem proxies (modo direto)."
+    ok, msg = _free_proxies_future().result()
+    if not ok:
+        _free_proxies_future.clear()  # permite nova tentativa na próxima busca
+    return ok, msg
+
+def _scholarly_search(area: str, max_results: int,
+                      use_proxies: bool) -> Tuple[List[Dict], List[str], str]:
+    """
+    Busca autores via scholarly.search_author(area); o cache fica com cached_fetch.
+    Não chama o Streamlit: retorna (resultados, erros, estado_dos_proxies) para quem chamou exibir.
+    Sem nenhum resultado (bloqueio/falha) levanta RuntimeError, para não ser gravado no cache.
     """
+    scholarly, _ = _get_scholarly()
     ok_proxy, proxy_msg = setup_scholarly(use_proxies)
     results: List[Dict] = []
-    if not HAS_SCHOLARLY:
-        st.info("Pulei scholarly: não está instalado/operante. Use SerpAPI (recomendado) ou instale a lib.")
-        return results
 
     try:
         q = scholarly.search_author(area)
     except Exception as e:
-        st.error(f"Falha ao iniciar pesquisa no scholarly: {e}")
-        return results
+        raise RuntimeError(f"Falha ao iniciar pesquisa no scholarly: {e}") from e
 
-    consecutive_errors = 0
-    while len(results) < max_results:
-        try:
-            author = next(q)              # pode falhar se bloqueado/sem mais resultados
-            author = scholarly.fill(author)  # carrega detalhes do perfil
-            results.append({
-                "name": author.get("name", "N/A"),
-                "citations": author.get("citedby", "N/A"),
-                "affiliation": author.get("affiliation", "N/A")
-            })
-            consecutive_errors = 0
-            jitter_sleep(0.8, 1.8)  # pequena pausa entre requisições
-        except StopIteration:
-            break
-        except Exception as e:
-            consecutive_errors += 1
-            st.warning(f"Erro ao buscar/ler autor (tentativa {consecutive_errors}): {e}")
-            # backoff simples
-            time.sleep(min(6, 1.5 ** consecutive_errors))
-            if consecutive_errors >= 3 and len(results) == 0:
-                # provavelmente bloqueado; abandona cedo para permitir fallback
+    # Pipeline produtor/consumidor: a listagem (next(q)) roda numa thread e alimenta
+    # `buf`; os workers fazem scholarly.fill em paralelo, sobrepondo descoberta e detalhes.
+    # As threads reportam tudo para a thread principal via `out_q`.
+    # Cada fill que falha pede um stub de reposição ao produtor (`target` += 1), até
+    # SCHOLARLY_MAX_ERRORS falhas seguidas, como o loop serial fazia ao seguir para o próximo.
+    pacer = _pacer()  # obtido aqui, na thread que chamou, e repassado aos workers
+    buf: queue.Queue = queue.Queue()
+    out_q: queue.Queue = queue.Queue()
+    stop = threading.Event()
+    cond = threading.Condition()
+    fills = {"target": max_results, "resolved": 0, "error_streak": 0}
+
+    def fill_resolved(failed: bool):
+        with cond:
+            if failed:
+                fills["error_streak"] += 1
+                if fills["error_streak"] < SCHOLARLY_MAX_ERRORS:
+                    fills["target"] += 1
+            else:
+                fills["error_streak"] = 0
+            fills["resolved"] += 1
+            cond.notify_all()
+
+    def produce():
+        produced = 0
+        consecutive_errors = 0
+        while not stop.is_set():
+            with cond:
+                # espera até precisar de mais um stub ou até todos os fills pendentes terminarem
+                cond.wait_for(lambda: stop.is_set() or produced < fills["target"]
+                              or fills["resolved"] >= produced)
+                if stop.is_set() or produced >= fills["target"]:
+                    break
+            try:
+                buf.put((produced, next(q)))  # pode falhar se bloqueado/sem mais resultados
+                produced += 1
+                consecutive_errors = 0
+            except StopIteration:
                 break
-            continue
+            except Exception as e:
+                consecutive_errors += 1
+                out_q.put(("list_error", (consecutive_errors, e)))
+                if produced == 0:
+                    if is_throttled(e) or consecutive_errors >= SCHOLARLY_MAX_ERRORS:
+                        # bloqueado logo de início: esperar não muda o resultado, libera o fallback já
+                        break
+                    continue  # nada a estender ainda: tenta de novo sem backoff
+                # backoff simples, só quando já há resultados parciais que vale a pena estender
+                time.sleep(min(6, 1.5 ** consecutive_errors))
+        for _ in range(SCHOLARLY_FILL_WORKERS):
+            buf.put(None)
+
+    def consume():
+        while True:
+            item = buf.get()
+            if item is None:
+                out_q.put(("done", None))
+                return
+            if stop.is_set():
+                continue
+            rank, author = item
+            try:
+                # o stub da busca costuma já trazer o que a UI mostra; só busca o perfil se faltar algo
+                if not all(author.get(k) for k in ("name", "citedby", "affiliation")):
+                    pace(pacer)  # ritmo compartilhado entre todos os workers
+                    author = scholarly.fill(author, sections=["basics"])  # só o básico do perfil
+                out_q.put(("author", (rank, author)))
+                fill_resolved(failed=False)
+            except Exception as e:
+                out_q.put(("fill_error", (rank, e)))
+                fill_resolved(failed=True)
+
+    threading.Thread(target=produce, daemon=True).start()
+    for _ in range(SCHOLARLY_FILL_WORKERS):
+        threading.Thread(target=consume, daemon=True).start()
+
+    filled = []
+    errors: List[str] = []  # acumulados: um st.warning por falha custaria um render cada
+    workers_done = 0
+    while len(filled) < max_results and workers_done < SCHOLARLY_FILL_WORKERS:
+        kind, payload = out_q.get()
+        if kind == "author":
+            filled.append(payload)
+        elif kind == "list_error":
+            attempt, e = payload
+            errors.append(f"busca, tentativa {attempt}: {e}")
+        elif kind == "fill_error":
+            rank, e = payload
+            errors.append(f"perfil do autor {rank + 1}: {e}")
+        else:
+            workers_done += 1
+    stop.set()
+    with cond:
+        cond.notify_all()  # acorda o produtor, caso esteja esperando fills pendentes
+
+    # os workers terminam fora de ordem: restaura a ordem de relevância da busca
+    for _, author in sorted(filled, key=lambda x: x[0]):
+        results.append({
+            "name": author.get("name", "N/A"),
+            "citations": author.get("citedby", "N/A"),
+            "affiliation": author.get("affiliation", "N/A")
+        })
+
+    if not results:
+        detail = f"{len(errors)} falhas (última: {errors[-1]})" if errors else "nenhum autor encontrado"
+        raise RuntimeError(f"scholarly não retornou resultados: {detail}. Proxies: {proxy_msg}")
+    return results, errors, proxy_msg
 
+
+def scholarly_fetch_authors(area: str, max_results: int, use_proxies: bool) -> List[Dict]:
+    """
+    Busca autores via scholarly (ver _scholarly_search).
+    Tenta contornar bloqueios com pequenas pausas e captura de erros.
+    """
+    scholarly, _ = _get_scholarly()
+    if scholarly is None:
+        st.info("Pulei scholarly: não está instalado/operante. Use SerpAPI (recomendado) ou instale a lib.")
+        return []
+
+    results, errors, proxy_msg = _scholarly_search(area, max_results, use_proxies)
+    if errors:
+        st.warning(f"{len(errors)} falhas durante a busca (última: {errors[-1]})")
     # Feedback de proxy
     st.caption(f"Estado dos proxies scholarly: {proxy_msg}")
     return results
 
 
-def serpapi_fetch_authors(area: str, max_results: int, api_key: str) -> List[Dict]:
+def _parse_serpapi_author(item: dict) -> dict:
     """
-    Usa SerpAPI (engine google_scholar_author) – solução estável para produção.
+    Extrai nome/citações/afiliação de um item de 'authors' da SerpAPI.
+    """
+    cb = item.get("cited_by")
+    if isinstance(cb, dict):
+        citations = (cb.get("table") or [{}])[0].get("citations", "N/A")
+    else:
+        citations = cb or "N/A"
+    return {
+        "name": item.get("name", "N/A"),
+        "citations": citations,
+        "affiliation": item.get("affiliations", "N/A"),
+    }
+
+
+def _serpapi_search(area: str, max_results: int, api_key: str) -> List[Dict]:
+    """
+    Requisição + parsing da SerpAPI, sem chamar o Streamlit; o cache fica com cached_fetch.
     """
     url = "https://serpapi.com/search"
     params = {
@@ -96,22 +500,39 @@ def serpapi_fetch_authors(area: str, max_results: int, api_key: str) -> List[Dic
         "q": area,
         "api_key": api_key,
     }
+    r = _http_session().get(url, params=params, timeout=30)
+    r.raise_for_status()
+    data = orjson.loads(r.content) if HAS_ORJSON else r.json()
+    return [_parse_serpapi_author(it) for it in (data.get("authors") or [])[:max_results]]
+
+
+def serpapi_fetch_authors(area: str, max_results: int, api_key: str) -> List[Dict]:
+    """
+    Usa SerpAPI (engine google_scholar_author) – solução estável para produção.
+    """
     try:
-        r = requests.get(url, params=params, timeout=30)
-        r.raise_for_status()
-        data = r.json()
-        out = []
-        for item in (data.get("authors") or [])[:max_results]:
-            out.append({
-                "name": item.get("name", "N/A"),
-                "citations": (item.get("cited_by") or {}).get("table", [{}])[0].get("citations", "N/A")
-                             if isinstance(item.get("cited_by"), dict) else item.get("cited_by"),
-                "affiliation": item.get("affiliations", "N/A"),
-            })
-        return out
+        return _serpapi_search(area, max_results, api_key)
     except Exception as e:
-        st.error(f"Erro na SerpAPI: {e}")
-        return []
+        raise RuntimeError(f"Erro na SerpAPI: {e}") from e
+
+
+def fetch_with_fallback(engine: str, area: str, max_results: int,
+                        fetch_fn: Callable[[], List[Dict]],
+                        refresh_fn: Callable[[], List[Dict]]) -> Tuple[List[Dict], str]:
+    """
+    cached_fetch + último resultado bom da sessão para a mesma (engine, area, max_results).
+    O fallback só é exibido: nunca passa por cache_set, então não ganha um fetched_at novo.
+    O erro vermelho só aparece se não houver nada para mostrar.
+    """
+    error = None
+    try:
+        results, cache_state = cached_fetch(engine, area, max_results, fetch_fn, refresh_fn)
+    except Exception as e:
+        results, cache_state, error = [], "ROTTEN", e
+    results, from_cache = remember_or_fallback(cache_key(engine, area, max_results), results)
+    if error is not None and not from_cache:
+        st.error(str(error))
+    return results, cache_state
 
 
 # -------------- Interface (opções) --------------
@@ -125,11 +546,17 @@ with st.sidebar:
     use_proxies = st.checkbox("Usar proxies gratuitos (scholarly)", value=True)
     serpapi_key = st.text_input("SERPAPI_KEY (opcional)", type="password", value=os.getenv("SERPAPI_KEY", ""))
 
+# Sem SerpAPI, scholarly é o caminho principal: aquece os proxies enquanto o usuário digita.
+# Com chave SerpAPI, FreeProxies só roda se o fallback para scholarly for realmente usado.
+if use_proxies and (engine == "Apenas Scholarly" or (engine.startswith("Auto") and not serpapi_key)):
+    _free_proxies_future()
+
 area = st.text_input("Área de pesquisa (ex.: 'machine learning', 'carbon footprint', 'climate change')",
                      placeholder="Digite a área...")
 
 if st.button("Buscar"):
-    if not area.strip():
+    area_norm = normalize_area(area)
+    if not area_norm:
         st.warning("Informe uma área de pesquisa válida.")
     else:
         with st.spinner("Buscando pesquisadores..."):
@@ -140,20 +567,36 @@ if st.button("Buscar"):
                           (engine.startswith("Auto") and bool(serpapi_key))
 
             if use_serpapi:
-                results = serpapi_fetch_authors(area.strip(), max_results, serpapi_key)
+                results, cache_state = fetch_with_fallback(
+                    "serpapi", area_norm, max_results,
+                    lambda: serpapi_fetch_authors(area_norm, max_results, serpapi_key),
+                    lambda: _serpapi_search(area_norm, max_results, serpapi_key))
                 if not results and engine.startswith("Auto"):
                     st.info("SerpAPI não retornou resultados. Tentando scholarly como fallback...")
-                    results = scholarly_fetch_authors(area.strip(), max_results, use_proxies)
+                    results, cache_state = fetch_with_fallback(
+                        "scholarly", area_norm, max_results,
+                        lambda: scholarly_fetch_authors(area_norm, max_results, use_proxies),
+                        lambda: _scholarly_search(area_norm, max_results, use_proxies)[0])
             else:
-                results = scholarly_fetch_authors(area.strip(), max_results, use_proxies)
+                results, cache_state = fetch_with_fallback(
+                    "scholarly", area_norm, max_results,
+                    lambda: scholarly_fetch_authors(area_norm, max_results, use_proxies),
+                    lambda: _scholarly_search(area_norm, max_results, use_proxies)[0])
+
+        st.caption(f"Cache: {cache_state} "
+                   f"(FRESH ≤ {caching_ttl}s; STALE ≤ {caching_ttl + caching_swr_ttl}s, revalidando em background; "
+                   f"ROTTEN = busca nova)")
 
         # Exibição
         if results:
             st.success(f"Encontrados {len(results)} pesquisadores para '{area}'.")
-            for i, r in enumerate(results, start=1):
-                with st.expander(f"{i}. {r.get('name','N/A')}"):
-                    st.write(f"- **Citações**: {r.get('citations','N/A')}")
-                    st.write(f"- **Universidade**: {r.get('affiliation','N/A')}")
+            # um único bloco de markdown em vez de um expander + 2 st.write por pesquisador
+            st.markdown("\n".join(
+                f"### {i}. {r.get('name','N/A')}\n"
+                f"- **Citações**: {r.get('citations','N/A')}\n"
+                f"- **Universidade**: {r.get('affiliation','N/A')}"
+                for i, r in enumerate(results, start=1)
+            ))
         else:
             st.warning("Nenhum resultado. Dicas:\n"
                        "• Ative proxies (scholarly) ou use SERPAPI_KEY\n"